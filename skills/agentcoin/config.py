@@ -4,16 +4,25 @@ Shared configuration module for AgentCoin mining tools.
 Handles environment variables, Web3 connection, and contract setup.
 """
 
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
 
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from eth_account import Account
+from eth_utils.abi import collapse_if_tuple, function_abi_to_4byte_selector
+from hexbytes import HexBytes
 from web3 import Web3
 from web3.contract import Contract
+from web3.contract.contract import ContractFunction
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
 
 
 # Load environment variables from .env file
@@ -26,77 +35,173 @@ DEFAULT_RPC_URL = "https://mainnet.base.org"
 DEFAULT_PROBLEM_MANAGER = "0x1234567890123456789012345678901234567890"
 DEFAULT_AGENT_REGISTRY = "0x0987654321098765432109876543210987654321"
 DEFAULT_REWARD_DISTRIBUTOR = "0xabcdefabcdefabcdefabcdefabcdefabcdefabcd"
+# Transaction parameters for Base mainnet (precomputed wei values)
+CHAIN_ID = 8453
+MAX_FEE_WEI = 100_000_000  # 0.1 gwei
+PRIORITY_FEE_WEI = 10_000_000  # 0.01 gwei
+RECEIPT_POLL_LATENCY = 2.0  # seconds, Base block time
+
+# Multicall3 is deployed at the same address on Base and most EVM chains
+DEFAULT_MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+ABIS_DIR = Path(__file__).parent / "abis"
+
+# RPC error meaning the locally tracked nonce is stale
+NONCE_TOO_LOW_ERROR = "nonce too low"
+# RPC error meaning this exact signed transaction is already in the mempool
+ALREADY_KNOWN_ERROR = "already known"
+
+
+@lru_cache(maxsize=None)
+def _load_abi(name: str) -> list:
+    """Load and parse an ABI file from abis/ (parsed once per process)."""
+    with open(ABIS_DIR / name) as f:
+        return json.load(f)
+
+
+def create_http_session(max_retries: int = 0) -> requests.Session:
+    """
+    Create a pooled, keep-alive HTTP session.
+    
+    Used for both the RPC endpoint and the problem API, so repeated calls
+    reuse the TCP/TLS connection instead of paying a fresh handshake.
+    
+    Args:
+        max_retries: Connection-level retries done by the adapter itself
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
 
 
 @dataclass
 class Config:
     """Configuration class for AgentCoin mining."""
     
-    private_key: str
+    private_key: Optional[bytes] = field(repr=False)
     rpc_url: str
     problem_manager_address: str
     agent_registry_address: str
     reward_distributor_address: str
+    multicall3_address: str = DEFAULT_MULTICALL3
     
-    # Web3 and contract instances (initialized after validation)
+    # Web3 and account instances (initialized after validation)
     w3: Optional[Web3] = None
     account: Optional[Account] = None
-    problem_manager: Optional[Contract] = None
-    agent_registry: Optional[Contract] = None
-    reward_distributor: Optional[Contract] = None
+    
+    # Next transaction nonce, tracked locally once seeded from the chain
+    _nonce: Optional[int] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
-        """Initialize Web3 connection and contracts after validation."""
+        """Initialize Web3 connection after validation."""
         self._init_web3()
-        self._load_contracts()
     
     def _init_web3(self) -> None:
         """Initialize Web3 connection."""
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        
-        if not self.w3.is_connected():
-            raise ConnectionError(
-                f"Failed to connect to Base chain at {self.rpc_url}. "
-                "Please check your RPC URL and network connection."
+        # No connectivity probe here: the first real RPC (read_status)
+        # surfaces connection problems, saving a round trip
+        if self.rpc_url.startswith(("ws://", "wss://")):
+            provider = Web3.WebsocketProvider(self.rpc_url)
+        else:
+            provider = Web3.HTTPProvider(
+                self.rpc_url,
+                session=create_http_session(),
+                request_kwargs={'timeout': 30}
             )
+        self.w3 = Web3(provider)
         
-        # Initialize account from private key
+        # Initialize account from private key. The account signs from here
+        # on, so the raw key isn't kept on the config.
         self.account = Account.from_key(self.private_key)
+        self.private_key = None
     
-    def _load_contracts(self) -> None:
-        """Load contract ABIs and create contract instances."""
-        abis_dir = Path(__file__).parent / "abis"
-        
-        # Load ProblemManager contract
-        pm_abi_path = abis_dir / "problem_manager.json"
-        with open(pm_abi_path) as f:
-            import json
-            pm_abi = json.load(f)
-        
-        self.problem_manager = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.problem_manager_address),
-            abi=pm_abi
+    # Contracts are built on first access, so commands only pay for the
+    # ABIs and contract objects they actually use
+    
+    @cached_property
+    def problem_manager(self) -> Contract:
+        """ProblemManager contract instance."""
+        return self._contract(self.problem_manager_address, "problem_manager.json")
+    
+    @cached_property
+    def agent_registry(self) -> Contract:
+        """AgentRegistry contract instance."""
+        return self._contract(self.agent_registry_address, "agent_registry.json")
+    
+    @cached_property
+    def reward_distributor(self) -> Contract:
+        """RewardDistributor contract instance."""
+        return self._contract(
+            self.reward_distributor_address, "reward_distributor.json"
         )
-        
-        # Load AgentRegistry contract
-        ar_abi_path = abis_dir / "agent_registry.json"
-        with open(ar_abi_path) as f:
-            ar_abi = json.load(f)
-        
-        self.agent_registry = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.agent_registry_address),
-            abi=ar_abi
+    
+    @cached_property
+    def multicall3(self) -> Contract:
+        """Multicall3 contract instance (batches status reads into one eth_call)."""
+        return self._contract(self.multicall3_address, "multicall3.json")
+    
+    def _contract(self, address: str, abi_name: str) -> Contract:
+        """Create a contract instance from a cached ABI."""
+        return self.w3.eth.contract(
+            address=Web3.to_checksum_address(address),
+            abi=_load_abi(abi_name)
         )
+    
+    # Contract functions are resolved against the ABI once; calling a
+    # resolved function skips web3's per-call lookup
+    
+    @cached_property
+    def submit_answer_fn(self) -> ContractFunction:
+        """ProblemManager.submitAnswer(problemId, answer)."""
+        return self.problem_manager.get_function_by_name('submitAnswer')
+    
+    @cached_property
+    def get_current_problem_fn(self) -> ContractFunction:
+        """ProblemManager.getCurrentProblem()."""
+        return self.problem_manager.get_function_by_name('getCurrentProblem')
+    
+    @cached_property
+    def agent_id_by_address_fn(self) -> ContractFunction:
+        """AgentRegistry.agentIdByAddress(address)."""
+        return self.agent_registry.get_function_by_name('agentIdByAddress')
+    
+    @cached_property
+    def claim_rewards_fn(self) -> ContractFunction:
+        """RewardDistributor.claimRewards()."""
+        return self.reward_distributor.get_function_by_name('claimRewards')
+    
+    @cached_property
+    def get_pending_rewards_fn(self) -> ContractFunction:
+        """RewardDistributor.getPendingRewards(address)."""
+        return self.reward_distributor.get_function_by_name('getPendingRewards')
+    
+    @cached_property
+    def total_claimed_fn(self) -> ContractFunction:
+        """RewardDistributor.totalClaimed(address)."""
+        return self.reward_distributor.get_function_by_name('totalClaimed')
+    
+    @cached_property
+    def aggregate3_fn(self) -> ContractFunction:
+        """Multicall3.aggregate3(calls)."""
+        return self.multicall3.get_function_by_name('aggregate3')
+    
+    @cached_property
+    def get_eth_balance_fn(self) -> ContractFunction:
+        """Multicall3.getEthBalance(address)."""
+        return self.multicall3.get_function_by_name('getEthBalance')
+    
+    @property
+    def supports_concurrent_rpc(self) -> bool:
+        """
+        Whether RPC calls may be made from several threads at once.
         
-        # Load RewardDistributor contract
-        rd_abi_path = abis_dir / "reward_distributor.json"
-        with open(rd_abi_path) as f:
-            rd_abi = json.load(f)
-        
-        self.reward_distributor = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.reward_distributor_address),
-            abi=rd_abi
-        )
+        HTTP requests each get their own pooled connection; the WebSocket
+        provider multiplexes one connection with no locking and can't.
+        """
+        return isinstance(self.w3.provider, Web3.HTTPProvider)
     
     @property
     def address(self) -> str:
@@ -108,9 +213,7 @@ class Config:
     def get_agent_id(self) -> Optional[int]:
         """Get the agent ID from the registry."""
         try:
-            agent_id = self.agent_registry.functions.agentIdByAddress(
-                self.address
-            ).call()
+            agent_id = self.agent_id_by_address_fn(self.address).call()
             return agent_id if agent_id > 0 else None
         except Exception:
             return None
@@ -121,6 +224,173 @@ class Config:
             raise RuntimeError("Web3 not initialized")
         balance_wei = self.w3.eth.get_balance(self.address)
         return self.w3.from_wei(balance_wei, 'ether')
+    
+    def next_nonce(self) -> int:
+        """
+        Get the nonce for the next transaction.
+        
+        Seeded once from the pending transaction count, then tracked locally
+        (advanced by send_transaction) so repeated submissions skip the
+        eth_getTransactionCount round trip.
+        """
+        if self._nonce is None:
+            self._nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+        return self._nonce
+    
+    def reset_nonce(self) -> None:
+        """Forget the tracked nonce so the next transaction re-syncs from the chain."""
+        self._nonce = None
+    
+    def build_tx(
+        self,
+        fn: ContractFunction,
+        args: list,
+        gas: int,
+        nonce: int
+    ) -> dict:
+        """
+        Build an EIP-1559 contract call transaction entirely locally.
+        
+        Calldata is encoded straight from the ABI and every field is filled
+        in, so web3's transaction builder (and any RPC it might make) is
+        skipped.
+        """
+        return {
+            'type': 2,
+            'from': self.address,
+            'to': fn.address,
+            'data': self._encode_call(fn, args),
+            'value': 0,
+            'nonce': nonce,
+            'gas': gas,
+            'maxFeePerGas': MAX_FEE_WEI,
+            'maxPriorityFeePerGas': PRIORITY_FEE_WEI,
+            'chainId': CHAIN_ID,
+        }
+    
+    def send_transaction(self, tx: dict) -> HexBytes:
+        """
+        Sign and send a transaction built with next_nonce().
+        
+        On success the local nonce advances. A node answering "already
+        known" has this very transaction pooled, so that counts as sent too.
+        On any other failure the nonce is dropped so the next transaction
+        re-syncs from the chain; a "nonce too low" rejection is retried once
+        with the re-synced nonce.
+        
+        Returns:
+            HexBytes: The transaction hash
+        """
+        for attempt in range(2):
+            signed_tx = self.account.sign_transaction(tx)
+            try:
+                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:
+                message = str(e).lower() if isinstance(e, ValueError) else ""
+                if ALREADY_KNOWN_ERROR in message:
+                    # Re-signing with a new nonce would broadcast a duplicate
+                    self._nonce = tx['nonce'] + 1
+                    return signed_tx.hash
+                self._nonce = None
+                if attempt or NONCE_TOO_LOW_ERROR not in message:
+                    raise
+                tx['nonce'] = self.next_nonce()
+            else:
+                self._nonce = tx['nonce'] + 1
+                return tx_hash
+    
+    def read_status(self) -> Dict[str, Any]:
+        """
+        Read balance, registration, rewards and current problem at once.
+        
+        All reads are batched into a single Multicall3 ``aggregate3`` call
+        with ``allowFailure`` set, so they cost one RPC round trip and come
+        from the same block. Chains without Multicall3 fall back to one
+        ``eth_call`` per read.
+        
+        Returns:
+            dict: ``eth_balance`` (ETH), ``agent_id``, ``pending_rewards``,
+            ``total_claimed`` (wei) and ``current_problem`` (tuple). A read
+            that failed is reported as None.
+        
+        Raises:
+            ConnectionError: If the RPC endpoint is unreachable
+        """
+        reads = [
+            ('eth_balance', self.get_eth_balance_fn, [self.address]),
+            ('agent_id', self.agent_id_by_address_fn, [self.address]),
+            ('pending_rewards', self.get_pending_rewards_fn, [self.address]),
+            ('total_claimed', self.total_claimed_fn, [self.address]),
+            ('current_problem', self.get_current_problem_fn, []),
+        ]
+        
+        try:
+            results = self.aggregate3_fn([
+                (fn.address, True, self._encode_call(fn, args))
+                for _, fn, args in reads
+            ]).call()
+        except (requests.exceptions.RequestException, OSError) as e:
+            raise ConnectionError(
+                f"Failed to connect to Base chain at {self.rpc_url}. "
+                "Please check your RPC URL and network connection."
+            ) from e
+        except (BadFunctionCallOutput, ContractLogicError):
+            # No Multicall3 on this chain
+            status = self._read_status_individually(reads)
+        else:
+            status = {
+                key: self._decode_result(fn, data) if success else None
+                for (key, fn, _), (success, data) in zip(reads, results)
+            }
+        
+        if status['eth_balance'] is not None:
+            status['eth_balance'] = self.w3.from_wei(status['eth_balance'], 'ether')
+        return status
+    
+    def _read_status_individually(self, reads: list) -> Dict[str, Any]:
+        """
+        Perform the status reads as separate calls.
+        
+        The reads are independent, so over HTTP they run concurrently and
+        cost about one round trip instead of one per read. A failed read is
+        reported as None without affecting the others.
+        """
+        def read(key: str, fn: ContractFunction, args: list) -> Any:
+            if key == 'eth_balance':
+                return self.w3.eth.get_balance(*args)
+            return fn(*args).call()
+        
+        workers = 4 if self.supports_concurrent_rpc else 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(read, key, *rest) for key, *rest in reads}
+        
+        status = {}
+        for key, future in futures.items():
+            try:
+                status[key] = future.result()
+            except Exception:
+                status[key] = None
+        return status
+    
+    def _encode_call(self, fn: ContractFunction, args: list) -> str:
+        """Encode calldata (selector + arguments) for a contract function."""
+        input_types = [collapse_if_tuple(i) for i in fn.abi['inputs']]
+        data = function_abi_to_4byte_selector(fn.abi) + self.w3.codec.encode(
+            input_types, args
+        )
+        return '0x' + data.hex()
+    
+    def _decode_result(self, fn: ContractFunction, data: bytes) -> Any:
+        """Decode raw return data of a contract view function."""
+        if not data:
+            # Call "succeeded" against an address with no code
+            return None
+        output_types = [collapse_if_tuple(o) for o in fn.abi['outputs']]
+        try:
+            values = self.w3.codec.decode(output_types, data)
+        except Exception:
+            return None
+        return values[0] if len(values) == 1 else values
 
 
 def load_config(
@@ -133,7 +403,9 @@ def load_config(
     """
     Load configuration from environment variables and/or CLI arguments.
     
-    CLI arguments take precedence over environment variables.
+    CLI arguments take precedence over environment variables. No RPC is
+    made here; connection problems surface on the first call (e.g.
+    ``Config.read_status()`` raises ConnectionError).
     
     Args:
         private_key: Private key for signing transactions (overrides env var)
@@ -146,8 +418,7 @@ def load_config(
         Config: Initialized configuration object
     
     Raises:
-        ValueError: If required configuration is missing
-        ConnectionError: If unable to connect to the blockchain
+        ValueError: If required configuration is missing or invalid
     """
     # Get private key (required)
     key = private_key or os.getenv("AGC_PRIVATE_KEY")
@@ -157,17 +428,23 @@ def load_config(
             "or pass --private-key argument."
         )
     
-    # Clean up private key (remove 0x prefix if present)
-    key = key.strip()
-    if key.startswith("0x"):
-        key = key[2:]
-    
-    # Validate private key format
+    # Clean up private key (remove 0x prefix if present) and validate it
+    key = key.strip().removeprefix("0x").removeprefix("0X")
     if len(key) != 64:
         raise ValueError(
             f"Invalid private key length: {len(key)} characters. "
             "Expected 64 hex characters (32 bytes)."
         )
+    # bytes.fromhex skips whitespace between byte pairs, so a key with
+    # embedded spaces parses short and is caught by the length check
+    try:
+        key_bytes = bytes.fromhex(key)
+    except ValueError:
+        key_bytes = b""
+    if len(key_bytes) != 32:
+        raise ValueError(
+            "Invalid private key: expected 64 hex characters (32 bytes)."
+        )
     
     # Get other configuration values
     rpc = rpc_url or os.getenv("AGC_RPC_URL", DEFAULT_RPC_URL)
@@ -180,67 +457,76 @@ def load_config(
     rd = reward_distributor or os.getenv(
         "REWARD_DISTRIBUTOR_ADDRESS", DEFAULT_REWARD_DISTRIBUTOR
     )
+    mc = os.getenv("MULTICALL3_ADDRESS", DEFAULT_MULTICALL3)
     
     return Config(
-        private_key=key,
+        private_key=key_bytes,
         rpc_url=rpc,
         problem_manager_address=pm,
         agent_registry_address=ar,
-        reward_distributor_address=rd
+        reward_distributor_address=rd,
+        multicall3_address=mc
     )
 
 
-def validate_config(config: Config) -> bool:
+def validate_config(
+    config: Config,
+    status: Optional[Dict[str, Any]] = None
+) -> bool:
     """
     Validate that the configuration is working properly.
     
     Args:
         config: Configuration object to validate
+        status: Result of config.read_status() if the caller already has
+            it (read here otherwise)
     
     Returns:
         bool: True if configuration is valid
     """
     try:
-        # Check Web3 connection
-        if not config.w3 or not config.w3.is_connected():
-            print("❌ Web3 connection failed")
-            return False
-        print(f"✓ Connected to {config.rpc_url}")
-        
         # Check account
         if not config.account:
             print("❌ Account not initialized")
             return False
         print(f"✓ Account loaded: {config.address}")
         
+        # Read balance, registration and contract state in one batch; this
+        # is the first RPC, so it doubles as the connection check
+        if status is None:
+            try:
+                status = config.read_status()
+            except ConnectionError as e:
+                print(f"❌ Web3 connection failed: {e}")
+                return False
+        print(f"✓ Connected to {config.rpc_url}")
+        
         # Check ETH balance
-        eth_balance = config.get_eth_balance()
+        eth_balance = status['eth_balance']
+        if eth_balance is None:
+            print("❌ Could not read ETH balance")
+            return False
         print(f"✓ ETH Balance: {eth_balance:.6f} ETH")
         if eth_balance < 0.001:
             print("⚠️  Warning: Low ETH balance for gas fees")
         
         # Check agent registration
-        agent_id = config.get_agent_id()
+        agent_id = status['agent_id']
         if agent_id:
             print(f"✓ Agent registered with ID: {agent_id}")
         else:
             print("⚠️  Agent not registered in registry")
         
         # Check contract connections
-        try:
-            # Try to call a view function on each contract
-            config.problem_manager.functions.getCurrentProblem().call()
+        if status['current_problem'] is not None:
             print("✓ ProblemManager contract accessible")
-        except Exception as e:
-            print(f"⚠️  ProblemManager contract issue: {e}")
+        else:
+            print("⚠️  ProblemManager contract issue: getCurrentProblem() failed")
         
-        try:
-            config.reward_distributor.functions.getPendingRewards(
-                config.address
-            ).call()
+        if status['pending_rewards'] is not None:
             print("✓ RewardDistributor contract accessible")
-        except Exception as e:
-            print(f"⚠️  RewardDistributor contract issue: {e}")
+        else:
+            print("⚠️  RewardDistributor contract issue: getPendingRewards() failed")
         
         return True
         
@@ -11,14 +11,17 @@ Usage:
     python mine.py --help
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 from decimal import Decimal
-from typing import Optional
-
-from web3.exceptions import ContractLogicError, TransactionNotFound
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from config import load_config, validate_config, Config
+# web3/eth_account/config are imported lazily so that --help and argument
+# errors don't pay for loading them
+if TYPE_CHECKING:
+    from config import Config
 
 
 def format_wei(wei_value: int) -> str:
@@ -46,22 +49,20 @@ def submit_answer(
     Returns:
         bool: True if submission was successful
     """
+    from web3.exceptions import ContractLogicError
+    from config import RECEIPT_POLL_LATENCY
+    
     try:
         print(f"📤 Submitting answer for problem #{problem_id}")
         print(f"   Answer: {answer}")
         
         # Build transaction
-        tx = config.problem_manager.functions.submitAnswer(
-            problem_id,
-            answer
-        ).build_transaction({
-            'from': config.address,
-            'nonce': config.w3.eth.get_transaction_count(config.address),
-            'gas': 300000,
-            'maxFeePerGas': config.w3.to_wei('0.1', 'gwei'),
-            'maxPriorityFeePerGas': config.w3.to_wei('0.01', 'gwei'),
-            'chainId': 8453,  # Base mainnet chain ID
-        })
+        tx = config.build_tx(
+            config.submit_answer_fn,
+            [problem_id, answer],
+            gas=300000,
+            nonce=config.next_nonce()
+        )
         
         if dry_run:
             print("   [DRY RUN] Transaction would be:")
@@ -69,18 +70,17 @@ def submit_answer(
             print(f"   Data: {tx.get('data', 'N/A')[:100]}...")
             return True
         
-        # Sign transaction
-        signed_tx = config.w3.eth.account.sign_transaction(tx, config.private_key)
-        
-        # Send transaction
+        # Sign and send transaction
         print("   Sending transaction...")
-        tx_hash = config.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = config.send_transaction(tx)
         tx_hash_hex = tx_hash.hex()
         print(f"   Transaction hash: {tx_hash_hex}")
         
         # Wait for receipt
         print("   Waiting for confirmation...")
-        receipt = config.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = config.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=120, poll_latency=RECEIPT_POLL_LATENCY
+        )
         
         if receipt['status'] == 1:
             print(f"✅ Transaction successful!")
@@ -110,11 +110,11 @@ def claim_rewards(config: Config, dry_run: bool = False) -> bool:
     Returns:
         bool: True if claim was successful
     """
+    from config import RECEIPT_POLL_LATENCY
+    
     try:
         # Check pending rewards first
-        pending = config.reward_distributor.functions.getPendingRewards(
-            config.address
-        ).call()
+        pending = config.get_pending_rewards_fn(config.address).call()
         
         if pending == 0:
             print("ℹ️  No pending rewards to claim")
@@ -123,14 +123,12 @@ def claim_rewards(config: Config, dry_run: bool = False) -> bool:
         print(f"💰 Claiming {format_wei(pending)}...")
         
         # Build transaction
-        tx = config.reward_distributor.functions.claimRewards().build_transaction({
-            'from': config.address,
-            'nonce': config.w3.eth.get_transaction_count(config.address),
-            'gas': 200000,
-            'maxFeePerGas': config.w3.to_wei('0.1', 'gwei'),
-            'maxPriorityFeePerGas': config.w3.to_wei('0.01', 'gwei'),
-            'chainId': 8453,
-        })
+        tx = config.build_tx(
+            config.claim_rewards_fn,
+            [],
+            gas=200000,
+            nonce=config.next_nonce()
+        )
         
         if dry_run:
             print("   [DRY RUN] Transaction would be:")
@@ -138,13 +136,14 @@ def claim_rewards(config: Config, dry_run: bool = False) -> bool:
             return True
         
         # Sign and send
-        signed_tx = config.w3.eth.account.sign_transaction(tx, config.private_key)
-        tx_hash = config.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = config.send_transaction(tx)
         
         print(f"   Transaction hash: {tx_hash.hex()}")
         print("   Waiting for confirmation...")
         
-        receipt = config.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        receipt = config.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=120, poll_latency=RECEIPT_POLL_LATENCY
+        )
         
         if receipt['status'] == 1:
             print(f"✅ Rewards claimed successfully!")
@@ -160,58 +159,64 @@ def claim_rewards(config: Config, dry_run: bool = False) -> bool:
         return False
 
 
-def show_status(config: Config) -> None:
-    """Display current mining status."""
-    print("\n" + "=" * 50)
-    print("          AGENTCOIN MINING STATUS")
-    print("=" * 50)
+def show_status(config: Config, status: Optional[Dict[str, Any]] = None) -> None:
+    """Display current mining status (from config.read_status() if given)."""
+    # All reads in one batched RPC call
+    if status is None:
+        status = config.read_status()
+    
+    # Output is collected and written with a single write
+    out = [
+        "\n" + "=" * 50,
+        "          AGENTCOIN MINING STATUS",
+        "=" * 50,
+    ]
     
     # Agent info
-    agent_id = config.get_agent_id()
-    print(f"\n👤 Agent Information:")
-    print(f"   Address: {config.address}")
-    print(f"   Agent ID: {agent_id if agent_id else 'Not registered'}")
+    agent_id = status['agent_id']
+    out.append("\n👤 Agent Information:")
+    out.append(f"   Address: {config.address}")
+    out.append(f"   Agent ID: {agent_id if agent_id else 'Not registered'}")
     
     # Wallet balances
-    eth_balance = config.get_eth_balance()
-    print(f"\n💳 Wallet Balance:")
-    print(f"   ETH: {eth_balance:.6f} (for gas fees)")
+    eth_balance = status['eth_balance']
+    out.append("\n💳 Wallet Balance:")
+    if eth_balance is not None:
+        out.append(f"   ETH: {eth_balance:.6f} (for gas fees)")
+    else:
+        out.append("   ETH: unavailable")
     
     # Rewards
-    try:
-        pending = config.reward_distributor.functions.getPendingRewards(
-            config.address
-        ).call()
-        claimed = config.reward_distributor.functions.totalClaimed(
-            config.address
-        ).call()
-        
-        print(f"\n🏆 Rewards:")
-        print(f"   Pending: {format_wei(pending)}")
-        print(f"   Total Claimed: {format_wei(claimed)}")
-    except Exception as e:
-        print(f"\n⚠️  Could not fetch rewards: {e}")
+    pending = status['pending_rewards']
+    claimed = status['total_claimed']
+    if pending is not None and claimed is not None:
+        out.append("\n🏆 Rewards:")
+        out.append(f"   Pending: {format_wei(pending)}")
+        out.append(f"   Total Claimed: {format_wei(claimed)}")
+    else:
+        out.append("\n⚠️  Could not fetch rewards")
     
     # Current problem
-    try:
-        problem = config.problem_manager.functions.getCurrentProblem().call()
-        if problem and problem[4]:  # active field
-            print(f"\n📋 Current Problem:")
-            print(f"   ID: {problem[0]}")
-            print(f"   Difficulty: {problem[2]}")
-            print(f"   Reward: {format_wei(problem[3])}")
-            print(f"   Deadline: Block {problem[5]}")
-            # Truncate long problem text
-            text = problem[1]
-            if len(text) > 60:
-                text = text[:57] + "..."
-            print(f"   Text: {text}")
-        else:
-            print(f"\n📋 No active problem currently")
-    except Exception as e:
-        print(f"\n⚠️  Could not fetch current problem: {e}")
+    problem = status['current_problem']
+    if problem and problem[4]:  # active field
+        out.append("\n📋 Current Problem:")
+        out.append(f"   ID: {problem[0]}")
+        out.append(f"   Difficulty: {problem[2]}")
+        out.append(f"   Reward: {format_wei(problem[3])}")
+        out.append(f"   Deadline: Block {problem[5]}")
+        # Truncate long problem text
+        text = problem[1]
+        if len(text) > 60:
+            text = text[:57] + "..."
+        out.append(f"   Text: {text}")
+    elif problem is None:
+        out.append("\n⚠️  Could not fetch current problem")
+    else:
+        out.append("\n📋 No active problem currently")
     
-    print("\n" + "=" * 50 + "\n")
+    out.append("\n" + "=" * 50 + "\n")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -296,6 +301,8 @@ def main() -> int:
         parser.print_help()
         return 1
     
+    from config import load_config, validate_config
+    
     try:
         # Load configuration
         config = load_config(
@@ -308,8 +315,10 @@ def main() -> int:
         
         # For status command, show even if validation has warnings
         if args.command == 'status':
-            validate_config(config)
-            show_status(config)
+            # One batched read serves both the checks and the report
+            status = config.read_status()
+            validate_config(config, status)
+            show_status(config, status)
             return 0
         
         # For other commands, ensure config is valid
@@ -10,18 +10,36 @@ Usage:
 """
 
 import argparse
+import ast
 import json
 import logging
+import math
+import random
 import re
+import string
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import lru_cache
+from itertools import compress
+from types import CodeType
+from typing import Optional, Set, Tuple
 
 import requests
+from hexbytes import HexBytes
 from web3.exceptions import ContractLogicError
 
-from config import load_config, validate_config, Config
+from config import (
+    load_config, validate_config, create_http_session, Config,
+    RECEIPT_POLL_LATENCY
+)
+
+# Optional faster JSON parser; orjson.JSONDecodeError subclasses json's
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 
 # Setup logging with timestamps and colors
@@ -37,17 +55,36 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'
     }
     
+    def __init__(self, *args, use_color: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_color = use_color
+        # Colorized level names are built once instead of on every record
+        reset = self.COLORS['RESET']
+        self._colored_levels = {
+            name: f"{color}{name}{reset}"
+            for name, color in self.COLORS.items()
+            if name != 'RESET'
+        }
+    
     def format(self, record):
-        color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        record.levelname = f"{color}{record.levelname}{self.COLORS['RESET']}"
-        return super().format(record)
+        if not self.use_color:
+            return super().format(record)
+        # Color only this handler's output; the record is shared with any
+        # other handlers (and threads) and must be left as it was
+        levelname = record.levelname
+        record.levelname = self._colored_levels.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
 
-# Configure logging
+# Configure logging (colors only when writing to a terminal)
 handler = logging.StreamHandler()
 handler.setFormatter(ColoredFormatter(
     '%(asctime)s | %(levelname)s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
+    datefmt='%Y-%m-%d %H:%M:%S',
+    use_color=handler.stream.isatty()
 ))
 logger = logging.getLogger('agentcoin-miner')
 logger.setLevel(logging.INFO)
@@ -58,11 +95,13 @@ API_BASE_URL = "https://api.agentcoin.site/api"
 DEFAULT_INTERVAL = 300  # 5 minutes
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+MAX_RETRY_DELAY = 30  # seconds
+PROBLEM_POLL_INTERVAL = 10  # seconds between on-chain checks while waiting
 
 
-@dataclass
+@dataclass(frozen=True)
 class Problem:
-    """Represents a mining problem."""
+    """Represents a mining problem (immutable, safe to share across threads)."""
     id: int
     text: str
     difficulty: int
@@ -84,6 +123,123 @@ class Problem:
         return self.text.replace(self.agent_id_placeholder, str(agent_id))
 
 
+# Problem-text patterns, compiled once at import
+MATH_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(?:calculate|what is|compute|solve)[\s:]*(\d+[\s\+\-\*\/\%\^\d\s\.]+\d)',
+        r'(\d+[\s\+\-\*\/\%\^\d\s\.]+\d)\s*(?:\?|=)',
+        r'([\d\s\+\-\*\/\%\^\.]+\d)',
+    )
+]
+FIB_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'fibonacci\s+(?:number|sequence)\s*(?:at\s+position\s*)?(\d+)',
+        r'(\d+)(?:st|nd|rd|th)?\s+fibonacci',
+    )
+]
+FACT_PATTERN = re.compile(r'(\d+)!|factorial\s+of\s+(\d+)', re.IGNORECASE)
+PRIME_PATTERN = re.compile(r'(\d+)(?:st|nd|rd|th)?\s+prime', re.IGNORECASE)
+COUNT_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'how many\s+(\w+)\s+in\s+["\']?([^"\']+)["\']?',
+        r'count\s+(?:the\s+)?(\w+)\s+(?:in\s+)?["\']?([^"\']+)["\']?',
+    )
+]
+NON_MATH_CHARS = re.compile(r'[^\d\+\-\*\/\%\(\)\.\s]')
+
+# AST nodes a safe arithmetic expression may contain
+SAFE_EVAL_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod,
+    ast.Pow, ast.FloorDiv, ast.USub, ast.UAdd
+)
+
+
+@lru_cache(maxsize=1024)
+def _compile_expr(expr: str) -> CodeType:
+    """
+    Parse, validate and compile a sanitized arithmetic expression.
+    
+    Cached per expression, so repeated problems skip the parse and AST walk.
+    Raises ValueError if the expression uses anything but arithmetic on
+    int/float literals.
+    """
+    tree = ast.parse(expr, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, SAFE_EVAL_NODES):
+            raise ValueError(f"Disallowed node type: {type(node)}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"Disallowed constant: {node.value!r}")
+    return compile(tree, '<string>', 'eval')
+
+
+# str.translate tables that delete one ASCII character class
+DIGITS_DEL = str.maketrans('', '', string.digits)
+LETTERS_DEL = str.maketrans('', '', string.ascii_letters)
+VOWELS_DEL = str.maketrans('', '', 'aeiouAEIOU')
+
+
+def _count_chars(text: str, delete_table: dict, predicate) -> int:
+    """Count characters of a class, using str.translate for ASCII text."""
+    if text.isascii():
+        return len(text) - len(text.translate(delete_table))
+    return sum(map(predicate, text))
+
+
+def _is_vowel(c: str) -> bool:
+    """Check if a character is a vowel."""
+    return c.lower() in 'aeiou'
+
+
+# Numeric helpers are pure, so results are shared across solved problems
+@lru_cache(maxsize=128)
+def fibonacci(n: int) -> int:
+    """Calculate nth Fibonacci number."""
+    if n <= 0:
+        return 0
+    # Fast doubling: F(2k) = F(k)(2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a
+
+
+@lru_cache(maxsize=128)
+def factorial(n: int) -> int:
+    """Calculate factorial."""
+    if n < 0:
+        return 0
+    return math.factorial(n)
+
+
+# Primes found so far, in order; rebuilt by a larger sieve when too short
+_primes = [2]
+
+
+def _extend_primes(n: int) -> None:
+    """Sieve far enough that _primes holds at least n primes."""
+    # p_n < n(ln n + ln ln n) for n >= 6; grow at least 2x to amortize
+    limit = 15 if n < 6 else int(n * (math.log(n) + math.log(math.log(n)))) + 1
+    limit = max(limit, 2 * _primes[-1])
+    sieve = bytearray(b'\x01') * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    _primes[:] = compress(range(limit + 1), sieve)
+
+
+def nth_prime(n: int) -> int:
+    """Find the nth prime number."""
+    if n <= 0:
+        return 0
+    if n > len(_primes):
+        _extend_primes(n)
+    return _primes[n - 1]
+
+
 class ProblemSolver:
     """Solver for AgentCoin math and logic problems."""
     
@@ -113,7 +269,7 @@ class ProblemSolver:
         Returns:
             str: The answer, or None if unable to solve
         """
-        logger.debug(f"Solving problem: {problem_text[:80]}...")
+        logger.debug("Solving problem: %.80s...", problem_text)
         
         # Try different solving strategies
         answer = None
@@ -144,14 +300,8 @@ class ProblemSolver:
         Uses safe evaluation with limited operators.
         """
         # Look for expressions like "Calculate: 2 + 2" or "What is 5 * 3?"
-        patterns = [
-            r'(?:calculate|what is|compute|solve)[\s:]*(\d+[\s\+\-\*\/\%\^\d\s\.]+\d)',
-            r'(\d+[\s\+\-\*\/\%\^\d\s\.]+\d)\s*(?:\?|=)',
-            r'([\d\s\+\-\*\/\%\^\.]+\d)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in MATH_PATTERNS:
+            match = pattern.search(text)
             if match:
                 expr = match.group(1).strip()
                 try:
@@ -163,7 +313,7 @@ class ProblemSolver:
                         self.solved_count += 1
                         return str(int(result)) if result == int(result) else str(result)
                 except Exception as e:
-                    logger.debug(f"Math evaluation failed for '{expr}': {e}")
+                    logger.debug("Math evaluation failed for '%s': %s", expr, e)
                     continue
         
         return None
@@ -175,36 +325,18 @@ class ProblemSolver:
         Only allows basic arithmetic operations.
         """
         # Remove any non-math characters
-        expr = re.sub(r'[^\d\+\-\*\/\%\(\)\.\s]', '', expr)
+        expr = NON_MATH_CHARS.sub('', expr)
         
         if not expr:
             return None
         
         try:
-            # Use ast.literal_eval for simple cases, or restricted eval
-            import ast
-            
-            # Parse the expression
-            tree = ast.parse(expr, mode='eval')
-            
-            # Validate only safe operations
-            allowed_nodes = (
-                ast.Expression, ast.BinOp, ast.UnaryOp, ast.Num,
-                ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod,
-                ast.Pow, ast.FloorDiv, ast.USub, ast.UAdd
-            )
-            
-            for node in ast.walk(tree):
-                if not isinstance(node, allowed_nodes):
-                    logger.debug(f"Disallowed node type: {type(node)}")
-                    return None
-            
-            # Evaluate safely
-            result = eval(compile(tree, '<string>', 'eval'), {"__builtins__": {}}, {})
+            # Evaluate the validated, compiled expression with no builtins
+            result = eval(_compile_expr(expr), {"__builtins__": {}}, {})
             return float(result)
             
         except Exception as e:
-            logger.debug(f"Safe eval failed: {e}")
+            logger.debug("Safe eval failed: %s", e)
             return None
     
     def _solve_pattern_problem(self, text: str) -> Optional[str]:
@@ -212,33 +344,27 @@ class ProblemSolver:
         # Common patterns: Fibonacci, prime numbers, factorials
         
         # Check for Fibonacci references
-        fib_patterns = [
-            r'fibonacci\s+(?:number|sequence)\s*(?:at\s+position\s*)?(\d+)',
-            r'(\d+)(?:st|nd|rd|th)?\s+fibonacci',
-        ]
-        for pattern in fib_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in FIB_PATTERNS:
+            match = pattern.search(text)
             if match:
                 n = int(match.group(1))
-                result = self._fibonacci(n)
+                result = fibonacci(n)
                 self.solved_count += 1
                 return str(result)
         
         # Check for factorial
-        fact_pattern = r'(\d+)!|factorial\s+of\s+(\d+)'
-        match = re.search(fact_pattern, text, re.IGNORECASE)
+        match = FACT_PATTERN.search(text)
         if match:
             n = int(match.group(1) or match.group(2))
-            result = self._factorial(n)
+            result = factorial(n)
             self.solved_count += 1
             return str(result)
         
         # Check for prime-related questions
-        prime_pattern = r'(\d+)(?:st|nd|rd|th)?\s+prime'
-        match = re.search(prime_pattern, text, re.IGNORECASE)
+        match = PRIME_PATTERN.search(text)
         if match:
             n = int(match.group(1))
-            result = self._nth_prime(n)
+            result = nth_prime(n)
             self.solved_count += 1
             return str(result)
         
@@ -247,25 +373,22 @@ class ProblemSolver:
     def _solve_sequence_problem(self, text: str) -> Optional[str]:
         """Solve sequence and counting problems."""
         # Count occurrences of specific characters/patterns
-        count_patterns = [
-            r'how many\s+(\w+)\s+in\s+["\']?([^"\']+)["\']?',
-            r'count\s+(?:the\s+)?(\w+)\s+(?:in\s+)?["\']?([^"\']+)["\']?',
-        ]
-        
-        for pattern in count_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in COUNT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 char_type = match.group(1).lower()
                 target = match.group(2)
                 
                 if char_type in ['digit', 'digits', 'number', 'numbers']:
-                    count = sum(c.isdigit() for c in target)
+                    count = _count_chars(target, DIGITS_DEL, str.isdigit)
                 elif char_type in ['letter', 'letters', 'char', 'chars', 'character']:
-                    count = sum(c.isalpha() for c in target)
+                    count = _count_chars(target, LETTERS_DEL, str.isalpha)
                 elif char_type in ['vowel', 'vowels']:
-                    count = sum(c.lower() in 'aeiou' for c in target)
+                    count = _count_chars(target, VOWELS_DEL, _is_vowel)
                 elif char_type in ['consonant', 'consonants']:
-                    count = sum(c.isalpha() and c.lower() not in 'aeiou' for c in target)
+                    # Every vowel is a letter, so consonants are the rest
+                    count = (_count_chars(target, LETTERS_DEL, str.isalpha)
+                             - _count_chars(target, VOWELS_DEL, _is_vowel))
                 else:
                     count = target.count(char_type)
                 
@@ -274,48 +397,6 @@ class ProblemSolver:
         
         return None
     
-    def _fibonacci(self, n: int) -> int:
-        """Calculate nth Fibonacci number."""
-        if n <= 0:
-            return 0
-        if n == 1:
-            return 1
-        a, b = 0, 1
-        for _ in range(2, n + 1):
-            a, b = b, a + b
-        return b
-    
-    def _factorial(self, n: int) -> int:
-        """Calculate factorial."""
-        if n < 0:
-            return 0
-        result = 1
-        for i in range(2, n + 1):
-            result *= i
-        return result
-    
-    def _nth_prime(self, n: int) -> int:
-        """Find the nth prime number."""
-        if n <= 0:
-            return 0
-        count = 0
-        num = 2
-        while True:
-            if self._is_prime(num):
-                count += 1
-                if count == n:
-                    return num
-            num += 1
-    
-    def _is_prime(self, num: int) -> bool:
-        """Check if a number is prime."""
-        if num < 2:
-            return False
-        for i in range(2, int(num ** 0.5) + 1):
-            if num % i == 0:
-                return False
-        return True
-    
     def get_stats(self) -> dict:
         """Get solver statistics."""
         total = self.solved_count + self.failed_count
@@ -337,6 +418,16 @@ class AutoMiner:
         self.running = False
         self.submissions = 0
         self.successful_submissions = 0
+        # Keep-alive API session; fetch_current_problem does its own retries
+        self.session = create_http_session(max_retries=0)
+        # Runs the pending receipt wait
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        # An address's agent ID never changes once registered, so it is
+        # only looked up until found
+        self._agent_id: Optional[int] = None
+        self._pending_receipt: Optional[Future] = None
+        # Problems already answered on-chain; never paid for twice
+        self._submitted_problem_ids: Set[int] = set()
     
     def fetch_current_problem(self) -> Optional[Problem]:
         """
@@ -346,14 +437,15 @@ class AutoMiner:
             Problem object or None if no active problem
         """
         url = f"{API_BASE_URL}/problem/current"
+        delay = RETRY_DELAY
         
         for attempt in range(MAX_RETRIES):
             try:
-                logger.debug(f"Fetching problem from {url}")
-                response = requests.get(url, timeout=30)
+                logger.debug("Fetching problem from %s", url)
+                response = self.session.get(url, timeout=30)
                 response.raise_for_status()
                 
-                data = response.json()
+                data = json_loads(response.content)
                 
                 # Handle different response formats
                 if isinstance(data, dict):
@@ -369,7 +461,8 @@ class AutoMiner:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"API request failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
                 if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY * (attempt + 1))  # Exponential backoff
+                    delay = self._retry_delay(e, delay)
+                    time.sleep(delay)
                 else:
                     logger.error("Max retries exceeded for API request")
                     return None
@@ -377,45 +470,88 @@ class AutoMiner:
                 logger.error(f"Failed to parse API response: {e}")
                 return None
     
+    @staticmethod
+    def _retry_delay(error: requests.exceptions.RequestException, prev_delay: float) -> float:
+        """
+        Pick the delay before the next API retry.
+        
+        Honors a Retry-After header (in seconds, capped at MAX_RETRY_DELAY)
+        when the API sends one; otherwise uses decorrelated jitter so
+        concurrent miners don't retry in lockstep.
+        """
+        response = error.response
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    seconds = float(retry_after)
+                except ValueError:
+                    seconds = None  # HTTP-date form, fall back to jitter
+                if seconds is not None and math.isfinite(seconds):
+                    return min(MAX_RETRY_DELAY, max(0.0, seconds))
+        return random.uniform(RETRY_DELAY, min(MAX_RETRY_DELAY, prev_delay * 3))
+    
     def submit_on_chain(self, problem_id: int, answer: str) -> bool:
         """
         Submit answer on-chain.
         
+        The transaction is sent here; over HTTP its receipt is awaited on
+        the thread pool so the miner can move on (and start its wait for the
+        next problem) while the block is produced. Providers that can't take
+        concurrent requests wait for it inline.
+        
         Args:
             problem_id: Problem ID
             answer: Answer to submit
         
         Returns:
-            bool: True if submission was successful
+            bool: True if the transaction was sent
         """
+        # Settle the previous submission first so at most one is in flight
+        self.wait_for_pending_receipt()
+        
         try:
             logger.info(f"📤 Submitting answer for problem #{problem_id}")
             
             # Build transaction
-            tx = self.config.problem_manager.functions.submitAnswer(
-                problem_id,
-                answer
-            ).build_transaction({
-                'from': self.config.address,
-                'nonce': self.config.w3.eth.get_transaction_count(self.config.address),
-                'gas': 300000,
-                'maxFeePerGas': self.config.w3.to_wei('0.1', 'gwei'),
-                'maxPriorityFeePerGas': self.config.w3.to_wei('0.01', 'gwei'),
-                'chainId': 8453,
-            })
-            
-            # Sign transaction
-            signed_tx = self.config.w3.eth.account.sign_transaction(
-                tx, self.config.private_key
+            tx = self.config.build_tx(
+                self.config.submit_answer_fn,
+                [problem_id, answer],
+                gas=300000,
+                nonce=self.config.next_nonce()
             )
             
-            # Send transaction
-            tx_hash = self.config.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # Sign and send (advances the locally tracked nonce)
+            tx_hash = self.config.send_transaction(tx)
             tx_hash_hex = tx_hash.hex()
             logger.info(f"   Transaction sent: {tx_hash_hex[:20]}...")
             
-            # Wait for receipt
-            receipt = self.config.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        except ContractLogicError as e:
+            logger.error(f"❌ Contract error: {e}")
+            self.submissions += 1
+            return False
+        except Exception as e:
+            logger.error(f"❌ Error submitting transaction: {e}")
+            self.submissions += 1
+            return False
+        
+        self._submitted_problem_ids.add(problem_id)
+        
+        if self.config.supports_concurrent_rpc:
+            # Wait for receipt in the background
+            self._pending_receipt = self._pool.submit(
+                self._confirm_transaction, problem_id, tx_hash
+            )
+        else:
+            self._confirm_transaction(problem_id, tx_hash)
+        return True
+    
+    def _confirm_transaction(self, problem_id: int, tx_hash: HexBytes) -> bool:
+        """Wait for a sent transaction's receipt and record the outcome."""
+        try:
+            receipt = self.config.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=120, poll_latency=RECEIPT_POLL_LATENCY
+            )
             
             if receipt['status'] == 1:
                 logger.info(f"✅ Transaction confirmed in block {receipt['blockNumber']}")
@@ -425,32 +561,51 @@ class AutoMiner:
                 logger.error(f"❌ Transaction failed (status: {receipt['status']})")
                 return False
                 
-        except ContractLogicError as e:
-            logger.error(f"❌ Contract error: {e}")
-            return False
         except Exception as e:
-            logger.error(f"❌ Error submitting transaction: {e}")
+            logger.error(f"❌ Error confirming transaction: {e}")
+            # The tx may have been dropped (e.g. at the fee cap); re-sync so
+            # later submissions don't queue behind a nonce that never mines,
+            # and let the problem be answered again
+            self.config.reset_nonce()
+            self._submitted_problem_ids.discard(problem_id)
             return False
         finally:
             self.submissions += 1
     
+    def wait_for_pending_receipt(self) -> Optional[bool]:
+        """
+        Block until the last sent transaction is confirmed.
+        
+        Returns:
+            bool: Whether it succeeded, or None if nothing was pending
+        """
+        if self._pending_receipt is None:
+            return None
+        try:
+            return self._pending_receipt.result()
+        finally:
+            self._pending_receipt = None
+    
     def run_single_iteration(self) -> bool:
         """
         Run a single mining iteration.
         
         Returns:
-            bool: True if successful submission, False otherwise
+            bool: True if an answer was submitted, False otherwise
         """
         # Fetch problem
         problem = self.fetch_current_problem()
         if not problem:
             return False
+        if problem.id in self._submitted_problem_ids:
+            logger.info(f"⏭️  Already submitted an answer for problem #{problem.id}, skipping")
+            return False
         
         logger.info(f"📋 Found problem #{problem.id} (difficulty: {problem.difficulty})")
-        logger.debug(f"   Text: {problem.text[:100]}...")
+        logger.debug("   Text: %.100s...", problem.text)
         
         # Get agent ID for personalization
-        agent_id = self.config.get_agent_id() or 0
+        agent_id = self._get_agent_id() or 0
         
         # Personalize problem text
         personalized_text = problem.personalize(agent_id)
@@ -466,6 +621,50 @@ class AutoMiner:
         # Submit on-chain
         return self.submit_on_chain(problem.id, answer)
     
+    def _get_agent_id(self) -> Optional[int]:
+        """Get the agent ID, reusing it once the agent is registered."""
+        if self._agent_id is None:
+            self._agent_id = self.config.get_agent_id()
+        return self._agent_id
+    
+    def _current_problem_id(self) -> Optional[int]:
+        """Read the on-chain current problem ID (None if inactive or unreadable)."""
+        try:
+            problem = self.config.get_current_problem_fn().call()
+        except Exception as e:
+            logger.debug("Current problem check failed: %s", e)
+            return None
+        return problem[0] if problem[4] else None  # id, active
+    
+    def _wait_for_next_check(self) -> None:
+        """
+        Sleep until the interval elapses or a new problem goes live.
+        
+        The on-chain current problem is polled with one eth_call every
+        PROBLEM_POLL_INTERVAL seconds; the contract emits no event when a
+        problem is created. A change of problem ID ends the wait early, so
+        fresh problems are picked up within seconds rather than at the end
+        of the interval.
+        
+        Only the chain is compared with itself: the baseline is the problem
+        live when the wait starts, so an API lagging behind the chain can't
+        cause repeated early wake-ups.
+        """
+        deadline = time.monotonic() + self.interval
+        baseline = self._current_problem_id()
+        
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(PROBLEM_POLL_INTERVAL, remaining))
+            
+            problem_id = self._current_problem_id()
+            if (problem_id is not None and problem_id != baseline
+                    and problem_id not in self._submitted_problem_ids):
+                logger.info(f"🆕 New problem #{problem_id} is live")
+                return
+    
     def run(self, one_shot: bool = False) -> None:
         """
         Run the auto-miner daemon.
@@ -477,7 +676,7 @@ class AutoMiner:
         logger.info("      AGENTCOIN AUTO-MINER STARTED")
         logger.info("=" * 60)
         logger.info(f"Address: {self.config.address}")
-        logger.info(f"Agent ID: {self.config.get_agent_id() or 'Not registered'}")
+        logger.info(f"Agent ID: {self._get_agent_id() or 'Not registered'}")
         logger.info(f"Interval: {self.interval} seconds")
         logger.info("-" * 60)
         
@@ -491,11 +690,19 @@ class AutoMiner:
                 except Exception as e:
                     logger.error(f"Error in mining iteration: {e}")
                 
-                # Show stats
+                if one_shot:
+                    # Nothing left to overlap with, so settle it now
+                    self.wait_for_pending_receipt()
+                
+                # Show stats (a tx still confirming is counted separately)
                 stats = self.solver.get_stats()
+                pending = self._pending_receipt
+                pending_note = (
+                    " (+1 pending)" if pending is not None and not pending.done() else ""
+                )
                 logger.info(
                     f"📊 Stats: {self.successful_submissions}/{self.submissions} "
-                    f"tx successful | Solver: {stats['solved']}/{stats['solved'] + stats['failed']} "
+                    f"tx successful{pending_note} | Solver: {stats['solved']}/{stats['solved'] + stats['failed']} "
                     f"({stats['success_rate']:.1f}%)"
                 )
                 
@@ -504,13 +711,22 @@ class AutoMiner:
                     break
                 
                 # Wait before next iteration
-                logger.info(f"⏳ Waiting {self.interval}s before next check...")
-                time.sleep(self.interval)
+                logger.info(f"⏳ Waiting up to {self.interval}s before next check...")
+                self._wait_for_next_check()
                 
         except KeyboardInterrupt:
             logger.info("\n⚠️  Interrupted by user, shutting down...")
         finally:
             self.running = False
+            if self._pending_receipt is not None:
+                logger.info("⏳ Waiting for the pending transaction to confirm...")
+                try:
+                    self.wait_for_pending_receipt()
+                except KeyboardInterrupt:
+                    # Still clean up and report below
+                    logger.info("⚠️  Stopped waiting for confirmation")
+            self.session.close()
+            self._pool.shutdown(wait=False)
             self._print_final_stats()
     
     def _print_final_stats(self) -> None: